@@ -5,11 +5,11 @@ MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
 """
 
-from pymongo import MongoClient
-from datetime import datetime, timezone
+from motor.motor_asyncio import AsyncIOMotorClient
+from datetime import date, datetime, timezone
 import os
 from dotenv import load_dotenv
-from typing import Union
+from typing import List, Union
 from pydantic import BaseModel
 
 # Load environment variables from .env file
@@ -22,11 +22,28 @@ database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
 if database_url and database_name:
-    _client = MongoClient(database_url)
+    # Pool settings are shared by every request in the worker; override via env when
+    # running more uvicorn workers against the same cluster
+    _client = AsyncIOMotorClient(
+        database_url,
+        maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", 50)),
+        minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", 5)),
+        waitQueueTimeoutMS=int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 2000)),
+        serverSelectionTimeoutMS=int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 3000)),
+        retryWrites=True,
+        compressors=os.getenv("MONGO_COMPRESSORS", "zstd,zlib"),
+    )
     db = _client[database_name]
 
+def _to_bson_dates(data_dict: dict) -> dict:
+    """BSON has no date-only type, so store dates as midnight datetimes"""
+    for k, v in data_dict.items():
+        if isinstance(v, date) and not isinstance(v, datetime):
+            data_dict[k] = datetime(v.year, v.month, v.day)
+    return data_dict
+
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -37,19 +54,39 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     else:
         data_dict = data.copy()
 
+    _to_bson_dates(data_dict)
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
 
-    result = db[collection_name].insert_one(data_dict)
+    result = await db[collection_name].insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
+async def create_documents(collection_name: str, data_list: List[Union[BaseModel, dict]], ordered: bool = True):
+    """Insert many documents with timestamps in one round-trip"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    now = datetime.now(timezone.utc)
+    docs = []
+    for data in data_list:
+        data_dict = _to_bson_dates(data.model_dump() if isinstance(data, BaseModel) else data.copy())
+        data_dict['created_at'] = now
+        data_dict['updated_at'] = now
+        docs.append(data_dict)
+
+    result = await db[collection_name].insert_many(docs, ordered=ordered)
+    return [str(i) for i in result.inserted_ids]
+
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, projection: dict = None, sort: list = None):
     """Get documents from collection"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    cursor = db[collection_name].find(filter_dict or {}, projection)
+    if sort:
+        cursor = cursor.sort(sort)
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    # The cursor already carries the limit; passing it to to_list would turn 0 into "nothing"
+    return await cursor.to_list(length=None)
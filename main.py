@@ -1,50 +1,483 @@
+import asyncio
+import hashlib
+import logging
 import os
-from fastapi import FastAPI, HTTPException
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.coder import JsonCoder
+from fastapi_cache.decorator import cache
+from fastapi_cache.types import Backend
+from redis import asyncio as aioredis
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from typing import Annotated, List, Optional
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
-from database import db, create_document, get_documents
+from database import db, create_document, create_documents, get_documents
 from schemas import Business, Promotion
 
-app = FastAPI(title="Promotion SaaS API", version="1.0.0")
+app = FastAPI(title="Promotion SaaS API", version="1.0.0", default_response_class=ORJSONResponse)
+
+# Comma-separated list of allowed origins; defaults to any origin
+ALLOWED_ORIGINS = [o.strip() for o in os.getenv("ALLOWED_ORIGINS", "*").split(",") if o.strip()]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Helpers
+logger = logging.getLogger(__name__)
 
-def to_object_id(id_str: str) -> ObjectId:
+# Cache
+
+CACHE_TTL = int(os.getenv("CACHE_TTL", 30))
+# Entry cap for the in-process fallback; keys include the raw query string, so it must be bounded
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+
+
+class BoundedMemoryBackend(Backend):
+    """In-process cache used without REDIS_URL: LRU-capped, with expired entries dropped on access"""
+
+    def __init__(self, max_entries: int):
+        self._store: OrderedDict = OrderedDict()
+        self._max_entries = max_entries
+
+    def _live(self, key: str):
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._store[key]
+            return None
+        self._store.move_to_end(key)
+        return entry
+
+    async def get_with_ttl(self, key: str):
+        entry = self._live(key)
+        if entry is None:
+            return 0, None
+        value, expires = entry
+        return (int(expires - time.monotonic()) if expires is not None else -1), value
+
+    async def get(self, key: str):
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    async def set(self, key: str, value: bytes, expire: int = None):
+        self._store[key] = (value, time.monotonic() + expire if expire else None)
+        self._store.move_to_end(key)
+        while len(self._store) > self._max_entries:
+            self._store.popitem(last=False)
+
+    async def clear(self, namespace: str = None, key: str = None) -> int:
+        if namespace:
+            keys = [k for k in self._store if k.startswith(namespace)]
+        else:
+            keys = [key] if key in self._store else []
+        for k in keys:
+            del self._store[k]
+        return len(keys)
+
+
+class CachedJSONCoder(JsonCoder):
+    """Serve cache hits as the stored JSON bytes instead of decoding and re-encoding them"""
+
+    @classmethod
+    def encode(cls, value) -> bytes:
+        if isinstance(value, Response):
+            return value.body
+        return orjson.dumps(value)
+
+    @classmethod
+    def decode_as_type(cls, value: bytes, *, type_=None):
+        return Response(content=value, media_type="application/json")
+
+
+def request_key_builder(func, namespace: str = "", *, request: Request = None, response: Response = None, args=(), kwargs=None):
+    return f"{namespace}:{request.url.path}?{request.url.query}"
+
+
+# Headers fastapi-cache sets on the injected response; a hit returns its own
+# Response, so they have to be carried over explicitly
+_CACHE_HEADERS = ("cache-control", "etag", "x-fastapi-cache")
+
+
+def cached(namespace: str = ""):
+    """fastapi-cache's @cache, keeping its cache headers on responses served from the cache"""
+    def wrapper(func):
+        cached_func = cache(namespace=namespace)(func)
+
+        @wraps(cached_func)
+        async def inner(*args, **kwargs):
+            response = kwargs.get("__fastapi_cache_response")
+            result = await cached_func(*args, **kwargs)
+            if isinstance(result, Response) and response is not None and result is not response:
+                for name in _CACHE_HEADERS:
+                    if name in response.headers:
+                        result.headers[name] = response.headers[name]
+            return result
+
+        return inner
+
+    return wrapper
+
+
+async def cached_body(namespace: str, request: Request):
+    """Cache lookup for streamed routes, which cannot go through @cache; returns (key, ttl, body)"""
+    key = request_key_builder(None, f"{FastAPICache.get_prefix()}:{namespace}", request=request)
+    try:
+        ttl, body = await FastAPICache.get_backend().get_with_ttl(key)
+    except Exception:
+        logger.warning("Error retrieving cache key %r", key, exc_info=True)
+        ttl, body = 0, None
+    return key, ttl, body
+
+
+async def tee_to_cache(chunks, key: str):
+    """Pass a streamed body through, storing the collected bytes once the stream completes"""
+    body = []
+    async for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+    try:
+        await FastAPICache.get_backend().set(key, b"".join(body), CACHE_TTL)
+    except Exception:
+        logger.warning("Error setting cache key %r", key, exc_info=True)
+
+
+@app.on_event("startup")
+async def init_cache():
+    redis_url = os.getenv("REDIS_URL")
+    backend = RedisBackend(aioredis.from_url(redis_url)) if redis_url else BoundedMemoryBackend(CACHE_MAX_ENTRIES)
+    FastAPICache.init(backend, prefix="api-cache", expire=CACHE_TTL, coder=CachedJSONCoder, key_builder=request_key_builder)
+
+
+async def invalidate_cache(namespace: str):
+    """Drop cached GET responses for a namespace"""
+    try:
+        await FastAPICache.clear(namespace)
+    except Exception:
+        logger.warning("Failed to clear cache namespace %r", namespace, exc_info=True)
+
+
+# Search
+
+# Set SEARCH_MODE=prefix where $text is unavailable; queries then run as
+# anchored regexes over lowercased shadow fields, which can use an index.
+TEXT_SEARCH = os.getenv("SEARCH_MODE", "text").lower() != "prefix"
+
+SEARCH_FIELDS = {
+    "business": ("name", "description", "industry"),
+    "promotion": ("title", "description", "terms"),
+}
+
+# Keep the shadow fields out of API responses
+SHADOW_PROJECTION = {
+    collection: {f"{field}_lc": 0 for field in fields}
+    for collection, fields in SEARCH_FIELDS.items()
+}
+
+TEXT_SCORE = {"score": {"$meta": "textScore"}}
+
+# $limit must be positive in an aggregation, so list_promotions bounds it up front
+MAX_LIST_LIMIT = 1000
+
+# List endpoints only ship the fields needed to render a summary
+LIST_PROJECTION = {
+    "business": {"name": 1, "industry": 1, "location": 1, "is_verified": 1},
+    "promotion": {"title": 1, "business_id": 1, "tags": 1, "is_active": 1, "discount_type": 1, "discount_value": 1, "end_date": 1},
+}
+
+
+def search_clause(collection: str, q: str) -> dict:
+    if TEXT_SEARCH:
+        return {"$text": {"$search": q}}
+    prefix = "^" + re.escape(q.lower())
+    return {"$or": [{f"{field}_lc": {"$regex": prefix}} for field in SEARCH_FIELDS[collection]]}
+
+
+def with_shadow_fields(collection: str, data: dict) -> dict:
+    # Shadow fields only serve prefix search; text mode skips the extra writes
+    if TEXT_SEARCH:
+        return data
+    for field in SEARCH_FIELDS[collection]:
+        value = data.get(field)
+        data[f"{field}_lc"] = value.lower() if isinstance(value, str) else None
+    return data
+
+
+async def backfill_shadow_fields():
+    """Populate *_lc fields on documents written before prefix search was turned on"""
+    if TEXT_SEARCH:
+        return
+    for collection, fields in SEARCH_FIELDS.items():
+        missing = {"$or": [{f"{field}_lc": {"$exists": False}} for field in fields]}
+        # Same rule as with_shadow_fields: lowercase strings, null otherwise
+        lowered = {
+            f"{field}_lc": {"$cond": [{"$eq": [{"$type": f"${field}"}, "string"]}, {"$toLower": f"${field}"}, None]}
+            for field in fields
+        }
+        await db[collection].update_many(missing, [{"$set": lowered}])
+
+
+async def migrate_business_ids():
+    """Convert promotion business_id values stored as strings before they became ObjectIds"""
+    await db["promotion"].update_many(
+        {"business_id": {"$type": "string", "$regex": "^[0-9a-fA-F]{24}$"}},
+        [{"$set": {"business_id": {"$toObjectId": "$business_id"}}}],
+    )
+    # Anything still a string cannot be converted; leave it for manual cleanup
+    malformed = await db["promotion"].count_documents({"business_id": {"$type": "string"}})
+    if malformed:
+        logger.warning("%d promotions have a business_id that is not a valid ObjectId; left unchanged", malformed)
+
+
+# Indexes
+
+async def create_index(collection: str, keys, **kwargs):
+    # A failed index only costs performance, so log it and carry on with the rest
     try:
-        return ObjectId(id_str)
+        await db[collection].create_index(keys, **kwargs)
     except Exception:
+        logger.warning("Could not create index %r on %s", kwargs.get("name", keys), collection, exc_info=True)
+
+
+async def ensure_indexes():
+    if TEXT_SEARCH:
+        # Weighted text indexes back the `q` search on the list endpoints
+        await create_index(
+            "business",
+            [("name", "text"), ("description", "text"), ("industry", "text")],
+            weights={"name": 10, "industry": 5, "description": 1},
+            name="biz_text",
+        )
+        await create_index(
+            "promotion",
+            [("title", "text"), ("description", "text"), ("terms", "text")],
+            weights={"title": 10, "terms": 5, "description": 1},
+            name="promo_text",
+        )
+    else:
+        # Lowercased shadow fields back the anchored prefix search fallback
+        for collection, fields in SEARCH_FIELDS.items():
+            for field in fields:
+                await create_index(collection, f"{field}_lc")
+    await create_index("promotion", "business_id")
+    # list_promotions filters on is_active plus an optional business_id or tag
+    await create_index("promotion", [("is_active", 1), ("business_id", 1)])
+    await create_index("promotion", [("is_active", 1), ("tags", 1)])
+    await create_index(
+        "promotion",
+        [("is_active", 1)],
+        partialFilterExpression={"is_active": True},
+        name="active_promotions",
+    )
+    # One active promotion per business and title, so retried creates are rejected by the index.
+    # This fails if existing active promotions already have duplicate titles.
+    await create_index(
+        "promotion",
+        [("business_id", 1), ("title", 1)],
+        unique=True,
+        partialFilterExpression={"is_active": True},
+        name="uniq_active_promo",
+    )
+
+
+async def prepare_database():
+    for step in (migrate_business_ids, backfill_shadow_fields, ensure_indexes):
+        try:
+            await step()
+        except Exception:
+            logger.warning("Database setup step %s failed", step.__name__, exc_info=True)
+
+
+_setup_tasks = set()
+
+
+@app.on_event("startup")
+async def start_database_setup():
+    # Run in the background so the API (and /test) comes up even when Mongo is down or slow
+    if db is None:
+        return
+    task = asyncio.create_task(prepare_database())
+    _setup_tasks.add(task)
+    task.add_done_callback(_setup_tasks.discard)
+
+
+# Helpers
+
+_OID_RE = re.compile(r"[0-9a-fA-F]{24}")
+
+
+@lru_cache(maxsize=1024)
+def to_object_id(id_str: str) -> ObjectId:
+    # Screen out malformed ids without going through bson's raise/catch path
+    if not _OID_RE.fullmatch(id_str):
         raise HTTPException(status_code=400, detail="Invalid id format")
+    return ObjectId(id_str)
+
+
+# ObjectId reference fields per collection; orjson handles dates natively so only
+# these keys need touching
+_REF_FIELDS = {
+    "business": frozenset(),
+    "promotion": frozenset({"business_id"}),
+}
+
+
+async def first_document(cursor):
+    """Pull the cursor's first batch, so query errors surface before a response has started"""
+    try:
+        return await cursor.next()
+    except StopAsyncIteration:
+        return None
+
+
+async def stream_json_array(first, cursor, kind: str, fields: dict = None):
+    """Encode `first` and the rest of the cursor into a JSON array, merging `fields` into each document"""
+    def encode(doc: dict) -> bytes:
+        if fields:
+            doc.update(fields)
+        return orjson.dumps(serialize(doc, kind))
+
+    yield b"["
+    if first is not None:
+        yield encode(first)
+        async for doc in cursor:
+            yield b"," + encode(doc)
+    yield b"]"
+
+
+async def business_fields(business_oid: ObjectId) -> dict:
+    biz = await db["business"].find_one({"_id": business_oid}, {"name": 1, "industry": 1})
+    fields = {}
+    # Mirror BUSINESS_LOOKUP, which leaves missing fields out
+    if biz and "name" in biz:
+        fields["business_name"] = biz["name"]
+    if biz and "industry" in biz:
+        fields["industry"] = biz["industry"]
+    return fields
+
+
+# Businesses are never deleted through the API, so a confirmed id can be trusted for a while
+KNOWN_BUSINESS_TTL = 300
+_KNOWN_BUSINESS_MAX = 10000
+_known_businesses: dict = {}
+
+
+async def business_exists(business_oid: ObjectId) -> bool:
+    now = time.monotonic()
+    expires = _known_businesses.get(business_oid)
+    if expires is not None and expires > now:
+        return True
+    if await db["business"].count_documents({"_id": business_oid}, limit=1) == 0:
+        return False
+    if len(_known_businesses) >= _KNOWN_BUSINESS_MAX:
+        _known_businesses.clear()
+    _known_businesses[business_oid] = now + KNOWN_BUSINESS_TTL
+    return True
+
 
+# Join promotions with business basic info
+BUSINESS_LOOKUP = [
+    {"$lookup": {
+        "from": "business",
+        "localField": "business_id",
+        "foreignField": "_id",
+        "as": "_biz",
+        "pipeline": [{"$project": {"name": 1, "industry": 1}}],
+    }},
+    {"$unwind": {"path": "$_biz", "preserveNullAndEmptyArrays": True}},
+    {"$addFields": {"business_name": "$_biz.name", "industry": "$_biz.industry"}},
+    {"$project": {"_biz": 0}},
+]
 
-def serialize(doc: dict):
+
+def build_list_pipeline(match: dict, limit: int, lookups: list, sort: dict = None, project: dict = None) -> list:
+    """Build a list aggregation with $match first and $limit ahead of any lookups"""
+    # MongoDB does not reliably move $match past $lookup/$unwind, so the order is
+    # fixed here: only the returned page of parent documents drives the joins
+    pipeline = [{"$match": match}]
+    if sort:
+        pipeline.append({"$sort": sort})
+    pipeline.append({"$limit": limit})
+    if project:
+        pipeline.append({"$project": project})
+    return pipeline + list(lookups)
+
+
+# Bulk payloads are validated as a whole list in one pass; each batch is a single insert_many
+MAX_BULK_ITEMS = 500
+_BIZ_LIST = TypeAdapter(Annotated[List[Business], Field(max_length=MAX_BULK_ITEMS)])
+_PROMO_LIST = TypeAdapter(Annotated[List[Promotion], Field(max_length=MAX_BULK_ITEMS)])
+
+
+def bulk_openapi(adapter: TypeAdapter) -> dict:
+    """Request body docs for endpoints that validate the raw body themselves"""
+    schema = adapter.json_schema(ref_template="#/components/schemas/{model}")
+    schema.pop("$defs", None)
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
+
+
+def validate_bulk(adapter: TypeAdapter, body: bytes) -> list:
+    try:
+        return adapter.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)])
+
+
+def duplicate_indexes(details: dict) -> Optional[set]:
+    """Batch positions that failed on a duplicate key, or None if anything else went wrong"""
+    errors = details.get("writeErrors", [])
+    if details.get("writeConcernErrors") or any(err.get("code") != 11000 for err in errors):
+        return None
+    return {err["index"] for err in errors}
+
+
+def remap_duplicate_ids(docs: list, duplicates: set, existing: dict) -> Optional[list]:
+    """Ids in batch order, with each duplicate replaced by the existing (business_id, title) match"""
+    ids = []
+    for i, d in enumerate(docs):
+        if i not in duplicates:
+            ids.append(str(d["_id"]))
+        elif (d["business_id"], d["title"]) in existing:
+            ids.append(existing[(d["business_id"], d["title"])])
+        else:
+            return None
+    return ids
+
+
+def serialize(doc: dict, kind: str):
     if not doc:
         return doc
     doc["id"] = str(doc.pop("_id"))
-    # Convert datetime to isoformat strings
-    for k, v in list(doc.items()):
-        if hasattr(v, "isoformat"):
-            doc[k] = v.isoformat()
+    for k in _REF_FIELDS[kind] & doc.keys():
+        v = doc[k]
+        doc[k] = str(v) if v is not None else v
     return doc
 
 
 @app.get("/")
-def read_root():
+@cached()
+async def read_root():
     return {"message": "Promotion SaaS API is running"}
 
 
 @app.get("/test")
-def test_database():
+async def test_database():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -59,7 +492,7 @@ def test_database():
             response["database_url"] = "✅ Set" if os.getenv("DATABASE_URL") else "❌ Not Set"
             response["database_name"] = getattr(db, "name", None) or "Unknown"
             try:
-                response["collections"] = db.list_collection_names()[:10]
+                response["collections"] = (await db.list_collection_names())[:10]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
                 response["database"] = f"⚠️ Connected but error: {str(e)[:80]}"
@@ -72,103 +505,227 @@ def test_database():
 
 # Business Endpoints
 @app.post("/api/business", response_model=dict)
-def create_business(business: Business):
-    inserted_id = create_document("business", business)
+async def create_business(business: Business):
+    inserted_id = await create_document("business", with_shadow_fields("business", business.model_dump()))
+    await invalidate_cache("business")
     return {"id": inserted_id}
 
 
+@app.post("/api/business/bulk", response_model=dict, openapi_extra=bulk_openapi(_BIZ_LIST))
+async def create_businesses_bulk(request: Request):
+    businesses = validate_bulk(_BIZ_LIST, await request.body())
+    if not businesses:
+        raise HTTPException(status_code=400, detail="No businesses to create")
+    inserted_ids = await create_documents("business", [with_shadow_fields("business", b.model_dump()) for b in businesses])
+    await invalidate_cache("business")
+    return {"ids": inserted_ids}
+
+
 @app.get("/api/business", response_model=List[dict])
-def list_businesses(q: Optional[str] = None, limit: int = 50):
+@cached(namespace="business")
+async def list_businesses(q: Optional[str] = None, limit: int = 50):
     filter_dict = {}
+    projection = dict(LIST_PROJECTION["business"])
+    sort = None
     if q:
-        filter_dict = {"$or": [
-            {"name": {"$regex": q, "$options": "i"}},
-            {"description": {"$regex": q, "$options": "i"}},
-            {"industry": {"$regex": q, "$options": "i"}},
-        ]}
-    docs = get_documents("business", filter_dict, limit)
-    return [serialize(d) for d in docs]
+        filter_dict = search_clause("business", q)
+        if TEXT_SEARCH:
+            projection.update(TEXT_SCORE)
+            sort = [("score", TEXT_SCORE["score"])]
+    docs = await get_documents("business", filter_dict, limit, projection=projection, sort=sort)
+    return [serialize(d, "business") for d in docs]
 
 
 @app.get("/api/business/{business_id}", response_model=dict)
-def get_business(business_id: str):
-    doc = db["business"].find_one({"_id": to_object_id(business_id)})
+@cached(namespace="business")
+async def get_business(business_id: str):
+    doc = await db["business"].find_one({"_id": to_object_id(business_id)}, SHADOW_PROJECTION["business"])
     if not doc:
         raise HTTPException(status_code=404, detail="Business not found")
-    return serialize(doc)
+    return serialize(doc, "business")
 
 
 # Promotion Endpoints
 @app.post("/api/promotions", response_model=dict)
-def create_promotion(promo: Promotion):
+async def create_promotion(promo: Promotion):
+    business_oid = to_object_id(promo.business_id)
     # Ensure business exists
-    if not db["business"].find_one({"_id": to_object_id(promo.business_id)}):
+    if not await business_exists(business_oid):
         raise HTTPException(status_code=400, detail="Related business does not exist")
-    inserted_id = create_document("promotion", promo)
+    data = with_shadow_fields("promotion", promo.model_dump())
+    data["business_id"] = business_oid
+    try:
+        inserted_id = await create_document("promotion", data)
+    except DuplicateKeyError:
+        # A retried create: return the promotion that already exists
+        existing = await db["promotion"].find_one(
+            {"business_id": business_oid, "title": promo.title, "is_active": True}, {"_id": 1}
+        )
+        if existing is None:
+            raise HTTPException(status_code=409, detail="Duplicate active promotion")
+        return {"id": str(existing["_id"])}
+    await invalidate_cache("promotion")
     return {"id": inserted_id}
 
 
+@app.post("/api/promotions/bulk", response_model=dict, openapi_extra=bulk_openapi(_PROMO_LIST))
+async def create_promotions_bulk(request: Request):
+    promos = validate_bulk(_PROMO_LIST, await request.body())
+    if not promos:
+        raise HTTPException(status_code=400, detail="No promotions to create")
+    business_oids = {to_object_id(p.business_id) for p in promos}
+    # Ensure every referenced business exists
+    if await db["business"].count_documents({"_id": {"$in": list(business_oids)}}) != len(business_oids):
+        raise HTTPException(status_code=400, detail="Related business does not exist")
+    docs = []
+    for p in promos:
+        data = with_shadow_fields("promotion", p.model_dump())
+        data["business_id"] = to_object_id(p.business_id)
+        # Assign ids up front so the inserted ones are known even when the batch partly fails
+        data["_id"] = ObjectId()
+        docs.append(data)
+    duplicates = set()
+    try:
+        inserted_ids = await create_documents("promotion", docs, ordered=False)
+    except BulkWriteError as e:
+        duplicates = duplicate_indexes(e.details)
+        if duplicates is None:
+            raise
+        # Only duplicate active promotions failed: a retried import, so report the
+        # existing ids in their place like create_promotion does
+        keys = {(docs[i]["business_id"], docs[i]["title"]) for i in duplicates}
+        cursor = db["promotion"].find(
+            {"$or": [{"business_id": b, "title": t, "is_active": True} for b, t in keys]},
+            {"business_id": 1, "title": 1},
+        )
+        existing = {(d["business_id"], d["title"]): str(d["_id"]) async for d in cursor}
+        inserted_ids = remap_duplicate_ids(docs, duplicates, existing)
+        if inserted_ids is None:
+            await invalidate_cache("promotion")
+            raise HTTPException(status_code=409, detail="Duplicate active promotion")
+    if len(duplicates) < len(docs):
+        await invalidate_cache("promotion")
+    return {"ids": inserted_ids}
+
+
 @app.get("/api/promotions", response_model=List[dict])
-def list_promotions(q: Optional[str] = None, tag: Optional[str] = None, business_id: Optional[str] = None, active: Optional[bool] = True, limit: int = 100):
+async def list_promotions(request: Request, q: Optional[str] = None, tag: Optional[str] = None, business_id: Optional[str] = None, active: Optional[bool] = True, limit: int = Query(100, ge=1, le=MAX_LIST_LIMIT)):
+    # Same semantics as @cache: no-store bypasses the cache, no-cache refreshes it
+    cache_control = request.headers.get("Cache-Control")
+    status_header = FastAPICache.get_cache_status_header()
+    key, ttl, body = await cached_body("promotion", request)
+    if body is not None and cache_control not in ("no-store", "no-cache"):
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"Cache-Control": f"max-age={ttl}", status_header: "HIT"},
+        )
     filter_dict: dict = {}
     and_clauses = []
     if q:
-        and_clauses.append({"$or": [
-            {"title": {"$regex": q, "$options": "i"}},
-            {"description": {"$regex": q, "$options": "i"}},
-            {"terms": {"$regex": q, "$options": "i"}},
-        ]})
+        and_clauses.append(search_clause("promotion", q))
     if tag:
         and_clauses.append({"tags": tag})
     if business_id:
-        and_clauses.append({"business_id": business_id})
+        business_oid = to_object_id(business_id)
+        and_clauses.append({"business_id": business_oid})
     if active is not None:
         and_clauses.append({"is_active": active})
     if and_clauses:
         filter_dict = {"$and": and_clauses}
-    docs = get_documents("promotion", filter_dict, limit)
-    # Join with business basic info
-    business_map = {str(b["_id"]): b for b in db["business"].find({}, {"name": 1, "industry": 1})}
-    enriched = []
-    for d in docs:
-        d = serialize(d)
-        biz = business_map.get(d.get("business_id"))
-        if biz:
-            d["business_name"] = biz.get("name")
-            d["industry"] = biz.get("industry")
-        enriched.append(d)
-    return enriched
+    projection = dict(LIST_PROJECTION["promotion"])
+    sort = None
+    if q and TEXT_SEARCH:
+        projection.update(TEXT_SCORE)
+        sort = TEXT_SCORE
+    if business_id:
+        # Every promotion shares one business, so fetch it alongside the
+        # promotions' first batch instead of joining it onto each document
+        pipeline = build_list_pipeline(filter_dict, limit, [], sort=sort, project=projection)
+        cursor = db["promotion"].aggregate(pipeline)
+        first, fields = await asyncio.gather(first_document(cursor), business_fields(business_oid), return_exceptions=True)
+        for result in (first, fields):
+            if isinstance(result, BaseException):
+                # Don't leave the server-side cursor open until it times out
+                await cursor.close()
+                raise result
+    else:
+        pipeline = build_list_pipeline(filter_dict, limit, BUSINESS_LOOKUP, sort=sort, project=projection)
+        cursor = db["promotion"].aggregate(pipeline)
+        first, fields = await first_document(cursor), None
+    stream = stream_json_array(first, cursor, "promotion", fields)
+    if cache_control == "no-store":
+        return StreamingResponse(stream, media_type="application/json")
+    return StreamingResponse(
+        tee_to_cache(stream, key),
+        media_type="application/json",
+        headers={"Cache-Control": f"max-age={CACHE_TTL}", status_header: "MISS"},
+    )
 
 
 @app.get("/api/promotions/{promo_id}", response_model=dict)
-def get_promotion(promo_id: str):
-    doc = db["promotion"].find_one({"_id": to_object_id(promo_id)})
+@cached(namespace="promotion")
+async def get_promotion(promo_id: str):
+    doc = await db["promotion"].find_one({"_id": to_object_id(promo_id)}, SHADOW_PROJECTION["promotion"])
     if not doc:
         raise HTTPException(status_code=404, detail="Promotion not found")
-    return serialize(doc)
+    return serialize(doc, "promotion")
 
 
 @app.patch("/api/promotions/{promo_id}", response_model=dict)
-def update_promotion_status(promo_id: str, is_active: Optional[bool] = None):
+async def update_promotion_status(promo_id: str, is_active: Optional[bool] = None):
     update = {}
     if is_active is not None:
         update["is_active"] = is_active
     if not update:
         raise HTTPException(status_code=400, detail="No fields to update")
-    res = db["promotion"].update_one({"_id": to_object_id(promo_id)}, {"$set": update})
-    if res.matched_count == 0:
+    try:
+        updated = await db["promotion"].find_one_and_update(
+            {"_id": to_object_id(promo_id)},
+            {"$set": update},
+            projection=SHADOW_PROJECTION["promotion"],
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        # Reactivating would clash with an active promotion of the same title (uniq_active_promo)
+        raise HTTPException(status_code=409, detail="Duplicate active promotion")
+    if updated is None:
         raise HTTPException(status_code=404, detail="Promotion not found")
-    updated = db["promotion"].find_one({"_id": to_object_id(promo_id)})
-    return serialize(updated)
+    await invalidate_cache("promotion")
+    return serialize(updated, "promotion")
 
 
 # Schema endpoint for viewer/debug
+# The models are static, so the schema is generated and encoded once at import
+_SCHEMA_CACHE = {
+    "business": Business.model_json_schema(),
+    "promotion": Promotion.model_json_schema(),
+}
+_SCHEMA_JSON = orjson.dumps(_SCHEMA_CACHE)
+_SCHEMA_ETAG = f'"{hashlib.sha1(_SCHEMA_JSON).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match list, as RFC 9110 requires"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
 @app.get("/schema")
-def get_schema():
-    return {
-        "business": Business.model_json_schema(),
-        "promotion": Promotion.model_json_schema(),
-    }
+async def get_schema(request: Request):
+    headers = {"ETag": _SCHEMA_ETAG}
+    if etag_matches(request.headers.get("if-none-match"), _SCHEMA_ETAG):
+        return Response(status_code=304, headers=headers)
+    return Response(content=_SCHEMA_JSON, media_type="application/json", headers=headers)
 
 
 if __name__ == "__main__":
@@ -36,7 +36,7 @@ class Promotion(BaseModel):
     Promotions collection schema
     Collection name: "promotion"
     """
-    business_id: str = Field(..., description="Related business document id (string)")
+    business_id: str = Field(..., pattern=r"^[0-9a-fA-F]{24}$", description="Related business document id, stored as an ObjectId")
     title: str = Field(..., description="Promotion title")
     description: Optional[str] = Field(None, description="Promotion details")
     image_url: Optional[str] = Field(None, description="Banner or product image URL")
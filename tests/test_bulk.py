@@ -0,0 +1,34 @@
+from bson import ObjectId
+
+from main import duplicate_indexes, remap_duplicate_ids
+
+
+def test_duplicate_indexes_collects_duplicate_key_errors():
+    details = {"writeErrors": [{"index": 1, "code": 11000}, {"index": 3, "code": 11000}]}
+    assert duplicate_indexes(details) == {1, 3}
+
+
+def test_duplicate_indexes_rejects_other_write_errors():
+    details = {"writeErrors": [{"index": 0, "code": 11000}, {"index": 1, "code": 121}]}
+    assert duplicate_indexes(details) is None
+
+
+def test_duplicate_indexes_rejects_write_concern_errors():
+    details = {"writeErrors": [{"index": 0, "code": 11000}], "writeConcernErrors": [{"code": 64}]}
+    assert duplicate_indexes(details) is None
+
+
+def test_remap_keeps_batch_order():
+    biz = ObjectId()
+    docs = [
+        {"_id": ObjectId(), "business_id": biz, "title": "new"},
+        {"_id": ObjectId(), "business_id": biz, "title": "dup"},
+    ]
+    existing_id = str(ObjectId())
+    ids = remap_duplicate_ids(docs, {1}, {(biz, "dup"): existing_id})
+    assert ids == [str(docs[0]["_id"]), existing_id]
+
+
+def test_remap_fails_when_existing_promotion_is_missing():
+    docs = [{"_id": ObjectId(), "business_id": ObjectId(), "title": "dup"}]
+    assert remap_duplicate_ids(docs, {0}, {}) is None
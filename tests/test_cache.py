@@ -0,0 +1,63 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import main
+from main import BoundedMemoryBackend
+
+
+def test_cache_hit_keeps_cache_headers():
+    with TestClient(main.app) as client:
+        miss = client.get("/")
+        hit = client.get("/")
+    assert miss.headers["x-fastapi-cache"] == "MISS"
+    assert hit.headers["x-fastapi-cache"] == "HIT"
+    assert hit.headers["cache-control"].startswith("max-age=")
+    assert hit.headers["etag"] == miss.headers["etag"]
+    assert hit.json() == miss.json()
+
+
+def test_cache_hit_answers_matching_etag_with_304():
+    with TestClient(main.app) as client:
+        etag = client.get("/").headers["etag"]
+        assert client.get("/", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_bounded_backend_evicts_least_recently_used():
+    backend = BoundedMemoryBackend(2)
+
+    async def run():
+        await backend.set("a", b"1", 30)
+        await backend.set("b", b"2", 30)
+        await backend.get("a")
+        await backend.set("c", b"3", 30)
+        return await backend.get("a"), await backend.get("b"), await backend.get("c")
+
+    assert asyncio.run(run()) == (b"1", None, b"3")
+
+
+def test_bounded_backend_drops_expired_entries(monkeypatch):
+    backend = BoundedMemoryBackend(10)
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: now[0])
+
+    async def run():
+        await backend.set("a", b"1", 30)
+        fresh = await backend.get_with_ttl("a")
+        now[0] += 31
+        return fresh, await backend.get_with_ttl("a")
+
+    assert asyncio.run(run()) == ((30, b"1"), (0, None))
+    assert "a" not in backend._store
+
+
+def test_bounded_backend_clears_namespace():
+    backend = BoundedMemoryBackend(10)
+
+    async def run():
+        await backend.set("api:promotion:/x?", b"1")
+        await backend.set("api:business:/y?", b"2")
+        cleared = await backend.clear(namespace="api:promotion")
+        return cleared, await backend.get("api:business:/y?")
+
+    assert asyncio.run(run()) == (1, b"2")
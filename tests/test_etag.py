@@ -0,0 +1,25 @@
+from main import etag_matches
+
+ETAG = '"abc123"'
+
+
+def test_exact_match():
+    assert etag_matches(ETAG, ETAG)
+
+
+def test_weak_tag_matches():
+    assert etag_matches(f"W/{ETAG}", ETAG)
+
+
+def test_tag_in_list():
+    assert etag_matches(f'"other", W/{ETAG}', ETAG)
+
+
+def test_wildcard():
+    assert etag_matches("*", ETAG)
+
+
+def test_no_match():
+    assert not etag_matches('"other"', ETAG)
+    assert not etag_matches(None, ETAG)
+    assert not etag_matches("", ETAG)
@@ -0,0 +1,19 @@
+from main import BUSINESS_LOOKUP, TEXT_SCORE, build_list_pipeline
+
+
+def test_match_is_first_stage():
+    pipeline = build_list_pipeline({"is_active": True}, 10, BUSINESS_LOOKUP)
+    assert list(pipeline[0]) == ["$match"]
+    assert pipeline[0]["$match"] == {"is_active": True}
+
+
+def test_limit_precedes_lookups():
+    pipeline = build_list_pipeline({}, 10, BUSINESS_LOOKUP, sort=TEXT_SCORE, project={"title": 1})
+    stages = [next(iter(stage)) for stage in pipeline]
+    assert stages[:4] == ["$match", "$sort", "$limit", "$project"]
+    assert stages.index("$limit") < stages.index("$lookup")
+    assert pipeline[2] == {"$limit": 10}
+
+
+def test_without_lookups():
+    assert build_list_pipeline({"a": 1}, 5, []) == [{"$match": {"a": 1}}, {"$limit": 5}]
@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+from bson import ObjectId
+
+from main import first_document, stream_json_array, tee_to_cache
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def next(self):
+        return await self.__anext__()
+
+
+def promotions(n):
+    return [{"_id": ObjectId(), "business_id": ObjectId(), "title": f"p{i}"} for i in range(n)]
+
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+def stream(docs, fields=None):
+    async def run():
+        cursor = FakeCursor(docs)
+        first = await first_document(cursor)
+        return await collect(stream_json_array(first, cursor, "promotion", fields))
+
+    return asyncio.run(run())
+
+
+def test_empty_cursor_streams_empty_array():
+    assert stream([]) == b"[]"
+
+
+def test_single_document():
+    docs = promotions(1)
+    expected_id = str(docs[0]["_id"])
+    body = json.loads(stream(docs))
+    assert len(body) == 1
+    assert body[0]["id"] == expected_id
+    assert isinstance(body[0]["business_id"], str)
+
+
+def test_many_documents_are_comma_separated_in_order():
+    body = json.loads(stream(promotions(3)))
+    assert [d["title"] for d in body] == ["p0", "p1", "p2"]
+
+
+def test_fields_are_merged_into_every_document():
+    body = json.loads(stream(promotions(2), {"business_name": "Acme"}))
+    assert all(d["business_name"] == "Acme" for d in body)
+
+
+def test_tee_stores_the_full_body(monkeypatch):
+    stored = {}
+
+    class Backend:
+        async def set(self, key, value, expire=None):
+            stored[key] = value
+
+    monkeypatch.setattr("main.FastAPICache.get_backend", lambda: Backend())
+
+    async def chunks():
+        for chunk in (b"[", b"{}", b"]"):
+            yield chunk
+
+    assert asyncio.run(collect(tee_to_cache(chunks(), "k"))) == b"[{}]"
+    assert stored == {"k": b"[{}]"}